@@ -1,6 +1,13 @@
 """ Cloudflare v4 API"""
-import json
+import io
 import keyword
+import logging
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+try:
+    from orjson import loads as json_loads # optional - faster parsing of large responses
+except ImportError:
+    from json import loads as json_loads
 from requests import RequestException as requests_RequestException, ConnectionError as requests_ConnectionError, exceptions as requests_exceptions, codes as requests_codes
 
 from .network import CFnetwork
@@ -15,6 +22,114 @@ from .exceptions import CloudFlareError, CloudFlareAPIError, CloudFlareInternalE
 
 BASE_URL = 'https://api.cloudflare.com/client/v4'
 
+# the calls available on every endpoint
+_VERBS = frozenset(['delete', 'get', 'patch', 'post', 'put'])
+
+def _ok(result):
+    """ wrap a successful (200 ok) response """
+
+    return {'success': True, 'result': result}
+
+def _err(code, result):
+    """ wrap a failed (3xx & 4xx errors) response """
+
+    return {'success': False, 'code': code, 'result': result}
+
+def _handle_json(base, response_code, response_data):
+    """ API says it's JSON; so it better be parsable as JSON """
+
+    # NDJSON is returned by Enterprise Log Share i.e. /zones/:id/logs/received
+    # json_loads() accepts the raw bytes - no need to decode into a (large) string first
+    try:
+        response_data = json_loads(response_data)
+        if not isinstance(response_data, (dict)):
+            response_data = _ok(response_data)
+    except ValueError:
+        if len(response_data) == 0:
+            # This should really be 'null' but it isn't. Even then, it's wrong!
+            if response_code == requests_codes.ok:
+                response_data = _ok(None)
+            else:
+                response_data = _err(response_code, None)
+        else:
+            # Lets see if it's NDJSON data
+            response_data = _handle_ndjson(base, response_code, response_data)
+
+    # 3xx & 4xx errors - we should report that somehow - but not quite yet
+    return response_data
+
+def _handle_ndjson(base, response_code, response_data):
+    """ NDJSON is a series of JSON elements with newlines between each element """
+
+    # walk the lines in place (vs splitlines()) - these responses can be very large
+    try:
+        return [json_loads(l) for l in io.BytesIO(response_data) if l.strip()]
+    except ValueError:
+        # While this should not happen; it's always possible
+        if base.logger and base.logger.isEnabledFor(logging.DEBUG):
+            base.logger.debug('Response data not JSON: %r', response_data)
+        raise CloudFlareAPIError(0, 'JSON parse failed - report to Cloudflare.')
+
+def _handle_x_ndjson(base, response_code, response_data):
+    """ API says it's NDJSON; so it better be parsable as NDJSON """
+
+    response_data = _handle_ndjson(base, response_code, response_data)
+    if response_code != requests_codes.ok:
+        # 3xx & 4xx errors
+        return _err(response_code, response_data)
+    return response_data
+
+def _handle_maybe_json(response_code, response_data, strict):
+    """ Not labeled as JSON; but maybe it's actually JSON? - should be fixed in API """
+
+    # strict - a parsed value is only used as-is if it's a full response (has 'success') and the status code is checked
+
+    # json_loads() accepts the raw bytes - only decode if a string result is needed
+    try:
+        response_data = json_loads(response_data)
+        if isinstance(response_data, (dict)) and (not strict or 'success' in response_data):
+            return response_data
+        if not strict:
+            return _ok(response_data)
+    except ValueError:
+        # So it wasn't JSON - moving on as if it's text!
+        # A single value is returned (vs an array or object)
+        response_data = response_data.decode('utf-8')
+    if response_code == requests_codes.ok:
+        return _ok(response_data)
+    return _err(response_code, response_data)
+
+def _handle_octet_stream(base, response_code, response_data):
+    """ API says it's binary; but maybe it's actually JSON? - should be fixed in API """
+
+    return _handle_maybe_json(response_code, response_data, True)
+
+def _handle_text(base, response_code, response_data):
+    """ API says it's text; but maybe it's actually JSON? - should be fixed in API """
+
+    return _handle_maybe_json(response_code, response_data, False)
+
+def _handle_other(base, response_code, response_data):
+    """ Assuming nothing - but continuing anyway """
+
+    # A single value is returned (vs an array or object)
+    if response_code == requests_codes.ok:
+        return _ok(str(response_data))
+    return _err(response_code, str(response_data))
+
+# response handlers - selected by the Content-Type of the response
+_CONTENT_TYPE_HANDLERS = {
+    'application/json': _handle_json,
+    'application/x-ndjson': _handle_x_ndjson,
+    'application/octet-stream': _handle_octet_stream,
+    'text/plain': _handle_text,
+    # used by Cloudflare workers
+    'text/javascript': _handle_other,
+    'application/javascript': _handle_other,
+    # used by media for preview
+    'text/html': _handle_other,
+}
+
 class CloudFlare():
     """ Cloudflare v4 API"""
 
@@ -33,126 +148,142 @@ class CloudFlare():
 
             # We must have a base_url value
             self.base_url = config['base_url'] if 'base_url' in config else BASE_URL
+            # url prefix for every call - a trailing slash would produce a '//' in the url
+            self._base_url = self.base_url.rstrip('/')
 
             self.raw = config['raw']
-            self.use_sessions = config['use_sessions']
+            self.use_sessions = config.get('use_sessions', True)
             self.global_request_timeout = config['global_request_timeout'] if 'global_request_timeout' in config else None
             self.max_request_retries = config['max_request_retries'] if 'max_request_retries' in config else None
+            self.pool_maxsize = config['pool_maxsize'] if 'pool_maxsize' in config else 10
             self.profile = config['profile']
             self.network = CFnetwork(
                 use_sessions=self.use_sessions,
                 global_request_timeout=self.global_request_timeout,
-                max_request_retries=self.max_request_retries
+                max_request_retries=self.max_request_retries,
+                pool_maxsize=self.pool_maxsize
             )
             self.user_agent = user_agent()
 
-            self.logger = CFlogger(config['debug']).getLogger() if 'debug' in config and config['debug'] else None
+            # default headers - copied (vs rebuilt) on every call
+            self._base_headers_json = {'User-Agent': self.user_agent, 'Content-Type': 'application/json'}
+            # passing javascript vs JSON
+            self._base_headers_javascript = {'User-Agent': self.user_agent, 'Content-Type': 'application/javascript'}
+            # uploading data - requests will add the multipart/form-data Content-Type (with its boundary)
+            self._base_headers_multipart = {'User-Agent': self.user_agent}
 
-        def __del__(self):
-            if self.network:
-                del self.network
-                self.network = None
+            self.logger = CFlogger(config['debug']).getLogger() if 'debug' in config and config['debug'] else None
 
-        def _add_headers(self, headers):
-            """ Add default headers """
-            headers['User-Agent'] = self.user_agent
-            headers['Content-Type'] = 'application/json'
+            # the auth values are fixed for the life of the class - so build the headers once
+            self._auth_headers_default = self._build_auth_headers(self.api_email, self.api_key, self.api_token)
+            self._certtoken_headers_default = self._build_certtoken_headers(self.api_certtoken)
+            # overrides are keyed by the method as passed in (i.e. 'GET') - so no per call lower() is needed
+            self._auth_headers_by_method = {}
+            self._certtoken_headers_by_method = {}
+            for m in ['get', 'patch', 'post', 'put', 'delete']:
+                if 'email.' + m in config or 'key.' + m in config or 'token.' + m in config:
+                    # do we have an override for specific calls? (i.e. token.post or email.get etc)
+                    self._auth_headers_by_method[m.upper()] = self._build_auth_headers(
+                        config['email.' + m] if 'email.' + m in config else self.api_email,
+                        config['key.' + m] if 'key.' + m in config else self.api_key,
+                        config['token.' + m] if 'token.' + m in config else self.api_token)
+                if 'certtoken.' + m in config:
+                    self._certtoken_headers_by_method[m.upper()] = self._build_certtoken_headers(config['certtoken.' + m])
+
+        def _base_headers(self, data, files):
+            """ Pick the default headers for this call """
 
-        def _add_auth_headers(self, headers, method):
-            """ Add authentication headers """
+            if files:
+                return self._base_headers_multipart.copy()
+            if isinstance(data, str):
+                return self._base_headers_javascript.copy()
+            return self._base_headers_json.copy()
 
-            v = 'email' + '.' + method.lower()
-            api_email = self.config[v] if v in self.config else self.api_email
-            v = 'key' + '.' + method.lower()
-            api_key = self.config[v] if v in self.config else self.api_key
-            v = 'token' + '.' + method.lower()
-            api_token = self.config[v] if v in self.config else self.api_token
+        @staticmethod
+        def _build_auth_headers(api_email, api_key, api_token):
+            """ Build authentication headers - returns (headers, None) or (None, error message) if the values are unusable """
 
             if api_email is None and api_key is None and api_token is None:
-                raise CloudFlareAPIError(0, 'neither email/key or token defined')
+                return None, 'neither email/key or token defined'
 
             if api_key is not None and api_token is not None:
-                raise CloudFlareAPIError(0, 'confused info - both key and token defined')
+                return None, 'confused info - both key and token defined'
 
             if api_email is not None and api_key is None and api_token is None:
-                raise CloudFlareAPIError(0, 'email defined however neither key or token defined')
+                return None, 'email defined however neither key or token defined'
 
             # We know at this point that at-least one api_* is set and no confusion!
 
-            if api_email is None and api_token is not None:
-                # post issue-114 - token is used
-                headers['Authorization'] = 'Bearer %s' % (api_token)
-            elif api_email is None and api_key is not None:
-                # pre issue-114 - key is used vs token - backward compat
-                headers['Authorization'] = 'Bearer %s' % (api_key)
-            elif api_email is not None and api_key is not None:
-                # boring old school email/key methodology (token ignored)
-                headers['X-Auth-Email'] = api_email
-                headers['X-Auth-Key'] = api_key
-            elif api_email is not None and api_token is not None:
-                # boring old school email/key methodology (token ignored)
-                headers['X-Auth-Email'] = api_email
-                headers['X-Auth-Key'] = api_token
-            else:
-                raise CloudFlareInternalError(0, 'coding issue!')
+            if api_email is None:
+                # post issue-114 - token is used (or pre issue-114 - key is used vs token - backward compat)
+                return {'Authorization': 'Bearer %s' % (api_token if api_token is not None else api_key)}, None
+            # boring old school email/key methodology (token ignored)
+            return {'X-Auth-Email': api_email, 'X-Auth-Key': api_key if api_key is not None else api_token}, None
 
-        def _add_certtoken_headers(self, headers, method):
+        def _add_auth_headers(self, headers, method):
             """ Add authentication headers """
 
-            v = 'certtoken' + '.' + method.lower()
-            if v in self.config:
-                api_certtoken = self.config[v] # use specific value for this method
-            else:
-                api_certtoken = self.api_certtoken # use generic value for all methods
+            auth_headers, error = self._auth_headers_by_method.get(method, self._auth_headers_default)
+            if error:
+                # the configuration can't be used for this call - report it now (vs when the class was created)
+                raise CloudFlareAPIError(0, error)
+            headers.update(auth_headers)
+
+        @staticmethod
+        def _build_certtoken_headers(api_certtoken):
+            """ Build authentication headers - returns (headers, None) or (None, error message) if the value is unusable """
 
             if api_certtoken is None:
-                raise CloudFlareAPIError(0, 'no cert token defined')
-            headers['X-Auth-User-Service-Key'] = api_certtoken
+                return None, 'no cert token defined'
+            return {'X-Auth-User-Service-Key': api_certtoken}, None
+
+        def _add_certtoken_headers(self, headers, method):
+            """ Add authentication headers """
+
+            # use specific value for this method or the generic value for all methods
+            certtoken_headers, error = self._certtoken_headers_by_method.get(method, self._certtoken_headers_default)
+            if error:
+                raise CloudFlareAPIError(0, error)
+            headers.update(certtoken_headers)
 
         def do_no_auth(self, method, parts, identifiers, params=None, data=None, files=None):
             """ Cloudflare v4 API"""
 
-            headers = {}
-            self._add_headers(headers)
+            headers = self._base_headers_json.copy()
             return self._call(method, headers, parts, identifiers, params, data, files)
 
-        def do_auth(self, method, parts, identifiers, params=None, data=None, files=None):
+        def do_auth(self, method, parts, identifiers, params=None, data=None, files=None, _handler=None):
             """ Cloudflare v4 API"""
 
-            headers = {}
-            self._add_headers(headers)
+            headers = self._base_headers(data, files)
             self._add_auth_headers(headers, method)
-            if isinstance(data, str):
-                # passing javascript vs JSON
-                headers['Content-Type'] = 'application/javascript'
-            if files:
-                # overwrite Content-Type as we are uploading data
-                headers['Content-Type'] = 'multipart/form-data'
-                # however something isn't right and this works ... look at again later!
-                del headers['Content-Type']
-            return self._call(method, headers, parts, identifiers, params, data, files)
+            if _handler is None:
+                _handler = self._call
+            return _handler(method, headers, parts, identifiers, params, data, files)
 
         def do_auth_unwrapped(self, method, parts, identifiers, params=None, data=None, files=None):
             """ Cloudflare v4 API"""
 
-            headers = {}
-            self._add_headers(headers)
-            self._add_auth_headers(headers, method)
-            if isinstance(data, str):
-                # passing javascript vs JSON
-                headers['Content-Type'] = 'application/javascript'
-            if files:
-                # overwrite Content-Type as we are uploading data
-                headers['Content-Type'] = 'multipart/form-data'
-                # however something isn't right and this works ... look at again later!
-                del headers['Content-Type']
-            return self._call_unwrapped(method, headers, parts, identifiers, params, data, files)
+            return self.do_auth(method, parts, identifiers, params, data, files, _handler=self._call_unwrapped)
+
+        def do_open(self, method, parts, identifiers, params=None, data=None, files=None):
+            """ Cloudflare v4 API"""
+
+            # open endpoints only support get()
+            if method != 'GET':
+                raise CloudFlareAPIError(0, '%s() call not available for this endpoint' % (method.lower()))
+            return self.do_no_auth(method, parts, identifiers, params, data, files)
+
+        def do_void(self, method, parts, identifiers, params=None, data=None, files=None):
+            """ Cloudflare v4 API"""
+
+            # an uncallable endpoint - only present so the tree can be built below it
+            raise CloudFlareAPIError(0, 'not found')
 
         def do_certauth(self, method, parts, identifiers, params=None, data=None, files=None):
             """ Cloudflare v4 API"""
 
-            headers = {}
-            self._add_headers(headers)
+            headers = self._base_headers_json.copy()
             self._add_certtoken_headers(headers, method)
             return self._call(method, headers, parts, identifiers, params, data, files)
 
@@ -165,48 +296,39 @@ class CloudFlare():
 
             # By this point we know that parts[] has 5 elements and identifiers[] has 4 elements (even if some are None)
 
+            # collect the url segments and join them once (vs repeated string concatenation)
+            segs = [self._base_url, parts[0]]
             if parts[1] is not None or (data is not None and method == 'GET'):
                 if identifiers[0] is None:
                     raise CloudFlareAPIError(0, 'You must specify first identifier')
-                if identifiers[1] is None:
-                    url = (self.base_url + '/'
-                           + parts[0] + '/'
-                           + identifiers[0] + '/'
-                           + parts[1])
-                else:
-                    url = (self.base_url + '/'
-                           + parts[0] + '/'
-                           + identifiers[0] + '/'
-                           + parts[1] + '/'
-                           + identifiers[1])
+                segs.append(identifiers[0])
+                if parts[1] is not None:
+                    segs.append(parts[1])
+                    if identifiers[1] is not None:
+                        segs.append(identifiers[1])
             else:
-                if identifiers[0] is None:
-                    url = (self.base_url + '/'
-                           + parts[0])
-                else:
-                    url = (self.base_url + '/'
-                           + parts[0] + '/'
-                           + identifiers[0])
+                if identifiers[0] is not None:
+                    segs.append(identifiers[0])
             if parts[2]:
-                url += '/' + parts[2]
+                segs.append(parts[2])
                 if identifiers[2]:
-                    url += '/' + identifiers[2]
+                    segs.append(identifiers[2])
                 if parts[3]:
-                    url += '/' + parts[3]
+                    segs.append(parts[3])
                     if identifiers[3]:
-                        url += '/' + identifiers[3]
+                        segs.append(identifiers[3])
                     if parts[4]:
-                        url += '/' + parts[4]
+                        segs.append(parts[4])
+            url = '/'.join(segs)
 
             if files and data:
                 # Can't send data and form data - so move data into files and send as multipart/form-data
-                new_files = []
-                new_files += [(f, (files[f].name, files[f])) for f in files]
-                new_files += [(d, (None, data[d])) for d in data]
-                files = tuple(new_files)
+                files = tuple(chain(((f, (fd.name, fd)) for f, fd in files.items()),
+                                    ((d, (None, v)) for d, v in data.items())))
                 data = None
 
-            if self.logger:
+            # build_curl() and large payloads are only worth the effort if debug output is going to be shown
+            if self.logger and self.logger.isEnabledFor(logging.DEBUG):
                 msg = build_curl(method, url, headers, params, data, files)
                 self.logger.debug('Call: emulated curl command ...\n%s', msg)
 
@@ -230,21 +352,14 @@ class CloudFlare():
                 raise
 
             # Create response_{type|code|data}
-            try:
-                response_type = response.headers['Content-Type']
-                if ';' in response_type:
-                    # remove the ;paramaters part (like charset=, etc.)
-                    response_type = response_type[0:response_type.rfind(';')]
-                response_type = response_type.strip().lower()
-            except:
-                # API should always response; but if it doesn't; here's the default
-                response_type = 'application/octet-stream'
+            # API should always response; but if it doesn't; here's the default
+            # remove the ;paramaters part (like charset=, etc.)
+            response_type = response.headers.get('Content-Type', 'application/octet-stream').partition(';')[0].strip().lower()
             response_code = response.status_code
+            # always bytes - decoding (if needed) is left to the response handlers
             response_data = response.content
-            if not isinstance(response_data, (str, bytes, bytearray)):
-                response_data = response_data.decode("utf-8")
 
-            if self.logger:
+            if self.logger and self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug('Response: %d, %s, %s', response_code, response_type, response_data)
 
             if response_code >= 500 and response_code <= 599:
@@ -297,142 +412,8 @@ class CloudFlare():
                                                                                identifiers,
                                                                                params, data, files)
 
-            if response_type == 'application/json':
-                # API says it's JSON; so it better be parsable as JSON
-                # NDJSON is returned by Enterprise Log Share i.e. /zones/:id/logs/received
-                if hasattr(response_data, 'decode'):
-                    response_data = response_data.decode('utf-8')
-                try:
-                    response_data = json.loads(response_data)
-                    if not isinstance(response_data, (dict)):
-                        response_data = {'success': True,
-                                         'result': response_data}
-                except ValueError:
-                    if response_data == '':
-                        # This should really be 'null' but it isn't. Even then, it's wrong!
-                        if response_code == requests_codes.ok:
-                            # 200 ok
-                            response_data = {'success': True,
-                                             'result': None}
-                        else:
-                            # 3xx & 4xx errors
-                            response_data = {'success': False,
-                                             'code': response_code,
-                                             'result': None}
-                    else:
-                        # Lets see if it's NDJSON data
-                        # NDJSON is a series of JSON elements with newlines between each element
-                        try:
-                            r = []
-                            for l in response_data.splitlines():
-                                r.append(json.loads(l))
-                            response_data = r
-                        except:
-                            # While this should not happen; it's always possible
-                            if self.logger:
-                                self.logger.debug('Response data not JSON: %r', response_data)
-                            raise CloudFlareAPIError(0, 'JSON parse failed - report to Cloudflare.')
-
-                if response_code == requests_codes.ok:
-                    # 200 ok - so nothing needs to be done
-                    pass
-                else:
-                    # 3xx & 4xx errors - we should report that somehow - but not quite yet
-                    # response_data['code'] = response_code
-                    pass
-            elif response_type == 'application/octet-stream' and isinstance(response_data, (int, float)):
-                # It's binary data
-                if response_code == requests_codes.ok:
-                    # 200 ok
-                    response_data = {'success': True,
-                                     'result': response_data}
-                else:
-                    # 3xx & 4xx errors
-                    response_data = {'success': False,
-                                     'code': response_code,
-                                     'result': response_data}
-            elif response_type == 'application/octet-stream' and isinstance(response_data, (bytes, bytearray)):
-                # API says it's text; but maybe it's actually JSON? - should be fixed in API
-                if hasattr(response_data, 'decode'):
-                    response_data = response_data.decode('utf-8')
-                try:
-                    response_data = json.loads(response_data)
-                    if not isinstance(response_data, (dict)) or 'success' not in response_data:
-                        if response_code == requests_codes.ok:
-                            # 200 ok
-                            response_data = {'success': True,
-                                             'result': response_data}
-                        else:
-                            # 3xx & 4xx errors
-                            response_data = {'success': False,
-                                             'code': response_code,
-                                             'result': response_data}
-                except ValueError:
-                    # So it wasn't JSON - moving on as if it's text!
-                    # A single value is returned (vs an array or object)
-                    if response_code == requests_codes.ok:
-                        # 200 ok
-                        response_data = {'success': True, 'result': response_data}
-                    else:
-                        # 3xx & 4xx errors
-                        response_data = {'success': False,
-                                         'code': response_code,
-                                         'result': response_data}
-            elif response_type in ['text/plain', 'application/octet-stream']:
-                # API says it's text; but maybe it's actually JSON? - should be fixed in API
-                if hasattr(response_data, 'decode'):
-                    response_data = response_data.decode('utf-8')
-                try:
-                    response_data = json.loads(response_data)
-                    if not isinstance(response_data, (dict)):
-                        response_data = {'success': True,
-                                         'result': response_data}
-                except ValueError:
-                    # So it wasn't JSON - moving on as if it's text!
-                    # A single value is returned (vs an array or object)
-                    if response_code == requests_codes.ok:
-                        # 200 ok
-                        response_data = {'success': True, 'result': response_data}
-                    else:
-                        # 3xx & 4xx errors
-                        response_data = {'success': False,
-                                         'code': response_code,
-                                         'result': response_data}
-            elif response_type in ['text/javascript', 'application/javascript']:
-                # used by Cloudflare workers
-                if response_code == requests_codes.ok:
-                    # 200 ok
-                    response_data = {'success': True,
-                                     'result': str(response_data)}
-                else:
-                    # 3xx & 4xx errors
-                    response_data = {'success': False,
-                                     'code': response_code,
-                                     'result': str(response_data)}
-            elif response_type == 'text/html':
-                # used by media for preview
-                if response_code == requests_codes.ok:
-                    # 200 ok
-                    response_data = {'success': True,
-                                     'result': str(response_data)}
-                else:
-                    # 3xx & 4xx errors
-                    response_data = {'success': False,
-                                     'code': response_code,
-                                     'result': str(response_data)}
-
-            else:
-                # Assuming nothing - but continuing anyway
-                # A single value is returned (vs an array or object)
-                if response_code == requests_codes.ok:
-                    # 200 ok
-                    response_data = {'success': True,
-                                     'result': str(response_data)}
-                else:
-                    # 3xx & 4xx errors
-                    response_data = {'success': False,
-                                     'code': response_code,
-                                     'result': str(response_data)}
+            handler = _CONTENT_TYPE_HANDLERS.get(response_type, _handle_other)
+            response_data = handler(self, response_code, response_data)
 
             # it would be nice to return the error code and content type values; but not quite yet
             return response_data
@@ -442,6 +423,10 @@ class CloudFlare():
 
             response_data = self._raw(method, headers, parts, identifiers, params, data, files)
 
+            if not isinstance(response_data, dict):
+                # NDJSON is returned as a list - it's the result
+                response_data = _ok(response_data)
+
             # Sanatize the returned results - just in case API is messed up
             if 'success' not in response_data:
                 if 'errors' in response_data:
@@ -454,18 +439,12 @@ class CloudFlare():
                         if self.logger:
                             self.logger.debug('Response: assuming success = "False"')
                         # The following only happens on /graphql call
-                        try:
-                            message = response_data['errors'][0]['message']
-                        except:
-                            message = ''
-                        try:
-                            location = str(response_data['errors'][0]['location'])
-                        except:
-                            location = ''
-                        try:
-                            path = '>'.join(response_data['errors'][0]['path'])
-                        except:
-                            path = ''
+                        errors = response_data['errors'][0] if response_data['errors'] else {}
+                        if not isinstance(errors, dict):
+                            errors = {}
+                        message = errors.get('message') or ''
+                        location = str(errors['location']) if 'location' in errors else ''
+                        path = '>'.join(map(str, errors.get('path') or []))
                         response_data['errors'] = [{'code': 99999, 'message': message + ' - ' + location + ' - ' + path}]
                         response_data['success'] = False
                 else:
@@ -484,20 +463,12 @@ class CloudFlare():
                         response_data['success'] = True
 
             if response_data['success'] is False:
-                if 'errors' in response_data and response_data['errors'] is not None:
-                    errors = response_data['errors'][0]
-                else:
+                errors = response_data.get('errors')
+                errors = errors[0] if errors else {}
+                if not isinstance(errors, dict):
                     errors = {}
-                if 'code' in errors:
-                    code = errors['code']
-                else:
-                    code = 99998
-                if 'message' in errors:
-                    message = errors['message']
-                elif 'error' in errors:
-                    message = errors['error']
-                else:
-                    message = ''
+                code = errors.get('code', 99998)
+                message = errors['message'] if 'message' in errors else errors.get('error', '')
                 ##if 'messages' in response_data:
                 ##    errors['error_chain'] = response_data['messages']
                 if 'error_chain' in errors:
@@ -530,7 +501,7 @@ class CloudFlare():
                     result = response_data['result']
                 except:
                     result = response_data
-            if self.logger:
+            if self.logger and self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug('Response: %s', result)
             return result
 
@@ -538,7 +509,7 @@ class CloudFlare():
             """ Cloudflare v4 API"""
 
             response_data = self._raw(method, headers, parts, identifiers, params, data, files)
-            if self.logger:
+            if self.logger and self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug('Response: %s', response_data)
             result = response_data
             return result
@@ -563,255 +534,73 @@ class CloudFlare():
 
             return response.text
 
-    class _add_unused():
-        """ Cloudflare v4 API"""
-
-        def __init__(self, base, parts):
-            """ Cloudflare v4 API"""
-
-            self._base = base
-            self._parts_unused = parts
-
-        def __call__(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            # This is the same as a get()
-            return self.get(identifier1, identifier2, identifier3, identifier4, params=params, data=data)
-
-        def __str__(self):
-            """ Cloudflare v4 API"""
-
-            return '[%s]' % ('/' + '/:id/'.join(filter(None, self._parts_unused)))
-
-        def get(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            raise CloudFlareAPIError(0, 'not found')
-
-        def patch(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            raise CloudFlareAPIError(0, 'not found')
-
-        def post(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None, files=None):
-            """ Cloudflare v4 API"""
-
-            raise CloudFlareAPIError(0, 'not found')
-
-        def put(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            raise CloudFlareAPIError(0, 'not found')
-
-        def delete(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            raise CloudFlareAPIError(0, 'not found')
-
-    class _add_no_auth():
-        """ Cloudflare v4 API"""
-
-        def __init__(self, base, parts):
-            """ Cloudflare v4 API"""
-
-            self._base = base
-            self._parts = parts
-
-        def __call__(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            # This is the same as a get()
-            return self.get(identifier1, identifier2, identifier3, identifier4, params=params, data=data)
-
-        def __str__(self):
-            """ Cloudflare v4 API"""
-
-            return '[%s]' % ('/' + '/:id/'.join(filter(None, self._parts)))
-
-        def get(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_no_auth('GET', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
-
-        def patch(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            raise CloudFlareAPIError(0, 'patch() call not available for this endpoint')
-
-        def post(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None, files=None):
-            """ Cloudflare v4 API"""
-
-            raise CloudFlareAPIError(0, 'post() call not available for this endpoint')
-
-        def put(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            raise CloudFlareAPIError(0, 'put() call not available for this endpoint')
-
-        def delete(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            raise CloudFlareAPIError(0, 'delete() call not available for this endpoint')
-
-    class _add_with_auth():
-        """ Cloudflare v4 API"""
-
-        def __init__(self, base, parts):
-            """ Cloudflare v4 API"""
-
-            self._base = base
-            self._parts = parts
-
-        def __call__(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            # This is the same as a get()
-            return self.get(identifier1, identifier2, identifier3, identifier4, params=params, data=data)
-
-        def __str__(self):
-            """ Cloudflare v4 API"""
-
-            return '[%s]' % ('/' + '/:id/'.join(filter(None, self._parts)))
-
-        def get(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_auth('GET', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
-
-        def patch(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_auth('PATCH', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
-
-        def post(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None, files=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_auth('POST', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data, files)
-
-        def put(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_auth('PUT', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
-
-        def delete(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_auth('DELETE', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
-
-    class _add_with_auth_unwrapped():
-        """ Cloudflare v4 API"""
-
-        def __init__(self, base, parts):
-            """ Cloudflare v4 API"""
-
-            self._base = base
-            self._parts = parts
-
-        def __call__(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            # This is the same as a get()
-            return self.get(identifier1, identifier2, identifier3, identifier4, params=params, data=data)
-
-        def __str__(self):
-            """ Cloudflare v4 API"""
-
-            return '[%s]' % ('/' + '/:id/'.join(filter(None, self._parts)))
-
-        def get(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_auth_unwrapped('GET', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
-
-        def patch(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_auth_unwrapped('PATCH', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
-
-        def post(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None, files=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_auth_unwrapped('POST', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data, files)
-
-        def put(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_auth_unwrapped('PUT', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
-
-        def delete(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
-            """ Cloudflare v4 API"""
-
-            return self._base.do_auth_unwrapped('DELETE', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
-
-    class _add_with_cert_auth():
+    class _endpoint():
         """ Cloudflare v4 API"""
 
-        def __init__(self, base, parts):
+        def __init__(self, dispatch, parts):
             """ Cloudflare v4 API"""
 
-            self._base = base
+            # dispatch is the bound _v4base method that handles this type of endpoint (i.e. do_auth)
+            self._dispatch = dispatch
             self._parts = parts
+            # the parts never change - so the string version is built once (on first use)
+            self._str = None
+            # the endpoints below this one - kept alongside the attributes so the tree can be walked cheaply
+            self._children = {}
 
         def __call__(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
             """ Cloudflare v4 API"""
 
-            # This is the same as a get()
-            return self.get(identifier1, identifier2, identifier3, identifier4, params=params, data=data)
+            # This is the same as a get() - called directly to save a method lookup and call
+            return self._dispatch('GET', self._parts, (identifier1, identifier2, identifier3, identifier4), params, data)
 
         def __str__(self):
             """ Cloudflare v4 API"""
 
-            return '[%s]' % ('/' + '/:id/'.join(filter(None, self._parts)))
+            if self._str is None:
+                self._str = '[%s]' % ('/' + '/:id/'.join(filter(None, self._parts)))
+            return self._str
 
         def get(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
             """ Cloudflare v4 API"""
 
-            return self._base.do_certauth('GET', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
+            return self._dispatch('GET', self._parts, (identifier1, identifier2, identifier3, identifier4), params, data)
 
         def patch(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
             """ Cloudflare v4 API"""
 
-            return self._base.do_certauth('PATCH', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
+            return self._dispatch('PATCH', self._parts, (identifier1, identifier2, identifier3, identifier4), params, data)
 
         def post(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None, files=None):
             """ Cloudflare v4 API"""
 
-            return self._base.do_certauth('POST', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data, files)
+            return self._dispatch('POST', self._parts, (identifier1, identifier2, identifier3, identifier4), params, data, files)
 
         def put(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
             """ Cloudflare v4 API"""
 
-            return self._base.do_certauth('PUT', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
+            return self._dispatch('PUT', self._parts, (identifier1, identifier2, identifier3, identifier4), params, data)
 
         def delete(self, identifier1=None, identifier2=None, identifier3=None, identifier4=None, params=None, data=None):
             """ Cloudflare v4 API"""
 
-            return self._base.do_certauth('DELETE', self._parts, [identifier1, identifier2, identifier3, identifier4], params, data)
+            return self._dispatch('DELETE', self._parts, (identifier1, identifier2, identifier3, identifier4), params, data)
 
     def add(self, t, p1, p2=None, p3=None, p4=None, p5=None):
         """add api call to class"""
+        # the tree is made of this class's own _endpoint objects
+        # pylint: disable=protected-access
 
-        a = []
-        if p1:
-            a += p1.split('/')
-        if p2:
-            a += p2.split('/')
-        if p3:
-            a += p3.split('/')
-        if p4:
-            a += p4.split('/')
-        if p5:
-            a += p5.split('/')
+        parts = (p1, p2, p3, p4, p5)
 
-        parts = [p1, p2, p3, p4, p5]
+        # the path elements (a part can hold more than one element - i.e. 'zones/settings')
+        a = [element for p in parts if p for element in p.split('/')]
 
         branch = self
         for element in a[0:-1]:
             try:
-                if '-' in element:
-                    branch = getattr(branch, element.replace('-','_'))
-                else:
-                    branch = getattr(branch, element)
+                # dashes (vs underscores) cause issues in Python and other languages
+                branch = getattr(branch, element.replace('-','_') if '-' in element else element)
             except AttributeError:
                 # missing path - should never happen unless api_v4 is a busted file
                 branch = None
@@ -821,88 +610,98 @@ class CloudFlare():
                 raise CloudFlareAPIError(0, 'api load: element **%s** missing when adding path /%s' % (element, '/'.join(a)))
 
         name = a[-1]
-        try:
-            if keyword.iskeyword(name):
-                ## add the keyword appended with an extra underscore so it can used with Python code
-                f = getattr(branch, name + '_')
-            else:
-                if '-' in name:
-                    # dashes (vs underscores) cause issues in Python and other languages
-                    f = getattr(branch, name.replace('-','_'))
-                else:
-                    f = getattr(branch, name)
-            # we only are here becuase the name already exists - don't let it overwrite - should never happen unless api_v4 is a busted file
-            raise CloudFlareAPIError(0, 'api load: duplicate name found: %s/**%s**' % ('/'.join(a[0:-1]), name))
-        except AttributeError:
-            # this is the required behavior - i.e. it's a new node to create
-            pass
-
-        if t == 'VOID':
-            f = self._add_unused(self._base, parts)
-        elif t == 'OPEN':
-            f = self._add_no_auth(self._base, parts)
-        elif t == 'AUTH':
-            f = self._add_with_auth(self._base, parts)
-        elif t == 'AUTH_UNWRAPPED':
-            f = self._add_with_auth_unwrapped(self._base, parts)
-        elif t == 'CERT':
-            f = self._add_with_cert_auth(self._base, parts)
+        if keyword.iskeyword(name):
+            ## add the keyword appended with an extra underscore so it can used with Python code
+            py_name = name + '_'
+        elif '-' in name:
+            # dashes (vs underscores) cause issues in Python and other languages
+            py_name = name.replace('-','_')
         else:
+            py_name = name
+
+        if py_name in branch._children or hasattr(type(branch), py_name):
+            # the name already exists (as an endpoint or a method) - don't let it overwrite - should never happen unless api_v4 is a busted file
+            raise CloudFlareAPIError(0, 'api load: duplicate name found: %s/**%s**' % ('/'.join(a[0:-1]), name))
+
+        try:
+            f = self._endpoint(self._dispatch[t], parts)
+        except KeyError:
             # should never happen
             raise CloudFlareAPIError(0, 'api load type mismatch')
 
-        if keyword.iskeyword(name):
-            ## add the keyword appended with an extra underscore so it can used with Python code
-            setattr(branch, name + '_', f)
-        else:
-            if '-' in name:
-                # dashes (vs underscores) cause issues in Python and other languages
-                setattr(branch, name.replace('-','_'), f)
-            else:
-                setattr(branch, name, f)
+        setattr(branch, py_name, f)
+        branch._children[py_name] = f
 
     def api_list(self):
         """recursive walk of the api tree returning a list of api calls"""
         return self._api_list(m=self)
 
-    def _api_list(self, m=None, s=''):
+    def _api_list(self, m=None, s='', w=None):
         """recursive walk of the api tree returning a list of api calls"""
-        w = []
-        for n in sorted(dir(m)):
-            if n[0] == '_':
-                # internal
-                continue
-            if n in ['delete', 'get', 'patch', 'post', 'put']:
-                # gone too far
-                continue
-            try:
-                a = getattr(m, n)
-            except AttributeError:
-                # really should not happen!
-                raise CloudFlareAPIError(0, '%s: not found - should not happen' % (n))
-            d = dir(a)
-            if '_base' in d:
-                # it's a known api call - lets show the result and continue down the tree
-                if 'delete' in d or 'get' in d or 'patch' in d or 'post' in d or 'put' in d:
-                    # only show the result if a call exists for this part
-                    if '_parts_unused' in d:
-                            # This is an uncallable endpoint - presently no way to return this info
-                            # w.append(str(a)[1:-1] + ' ; UNUSED')
-                            pass
-                    if '_parts' in d:
-                        if n[-1] == '_':
-                            if  keyword.iskeyword(n[:-1]):
-                                # should always be a keyword - but now nothing needs to be done
-                                pass
-                            # remove the extra keyword postfix'ed with underscore
-                            w.append(str(a)[1:-1])
-                        else:
-                            # handle underscores by returning the actual API call vs the method name
-                            w.append(str(a)[1:-1])
-                # now recurse downwards into the tree
-                w = w + self._api_list(a, s + '/' + n)
+        # the tree is made of this class's own _endpoint objects
+        # pylint: disable=protected-access
+        if w is None:
+            w = []
+        for n, a in sorted(m._children.items()):
+            # it's a known api call - lets show the result and continue down the tree
+            if a._dispatch == self._base.do_void:
+                # This is an uncallable endpoint - presently no way to return this info
+                # w.append(str(a)[1:-1] + ' ; UNUSED')
+                pass
+            else:
+                # keywords (postfix'ed with underscore) and underscores are handled by returning the actual API call vs the method name
+                w.append(str(a)[1:-1])
+            # now recurse downwards into the tree (appending to the same list)
+            self._api_list(a, s + '/' + n, w)
         return w
 
+    def batch(self, calls, max_workers=10):
+        """run a list of api calls concurrently - returning the results in the same order"""
+
+        # each call is (endpoint, method, identifiers, params, data) with the trailing values optional
+        # i.e. (cf.zones.dns_records, 'GET', (zone_id,), {'per_page': 100})
+        # a call can also be a function; it's passed the results so far and returns a call
+        results = [None] * len(calls)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            n = 0
+            while n < len(calls):
+                # run a wave of calls - either all independent or all depending on the previous waves
+                start = n
+                dependent = callable(calls[n])
+                while n < len(calls) and callable(calls[n]) == dependent:
+                    n += 1
+                if dependent:
+                    wave = [c(results[0:start]) for c in calls[start:n]]
+                else:
+                    wave = calls[start:n]
+                futures = [executor.submit(self._batch_call, c) for c in wave]
+                for ii, future in enumerate(futures):
+                    # CloudFlareError has a len() (the error chain) so can test as False - hence future.result() would not raise it
+                    e = future.exception()
+                    if e is not None:
+                        raise e
+                    results[start + ii] = future.result()
+        return results
+
+    @staticmethod
+    def _batch_call(call):
+        """run a single call from batch()"""
+
+        endpoint, method, identifiers, params, data = (tuple(call) + (None, None, None))[0:5]
+        if identifiers is None:
+            identifiers = ()
+        elif isinstance(identifiers, str):
+            identifiers = (identifiers,)
+        verb = method.lower() if isinstance(method, str) else None
+        if verb not in _VERBS:
+            # the endpoints below this one are attributes too - don't call one of those by mistake
+            raise CloudFlareAPIError(0, '%s: method not supported by batch()' % (method))
+        try:
+            f = getattr(endpoint, verb)
+        except AttributeError:
+            raise CloudFlareAPIError(0, '%s: method not supported by batch()' % (method)) from None
+        return f(*identifiers, params=params, data=data)
+
     def api_from_web(self):
         """ Cloudflare v4 API"""
 
@@ -913,10 +712,14 @@ class CloudFlare():
 
         return api_decode_from_openapi(self._base.api_from_openapi(url))
 
-    def __init__(self, email=None, key=None, token=None, certtoken=None, debug=False, raw=False, use_sessions=True, profile=None, base_url=None, global_request_timeout=5, max_request_retries=5):
+    # every argument is an optional override of a configuration value - hence more than max-args
+    def __init__(self, email=None, key=None, token=None, certtoken=None, debug=False, raw=False, use_sessions=True, profile=None, base_url=None, # pylint: disable=too-many-arguments
+                 global_request_timeout=5, max_request_retries=5, pool_maxsize=10):
         """ Cloudflare v4 API"""
 
         self._base = None
+        # the top level endpoints - see add()
+        self._children = {}
 
         try:
             config = read_configs(profile)
@@ -924,37 +727,38 @@ class CloudFlare():
             raise e
 
         # class creation values override all configuration values
-        if email is not None:
-            config['email'] = email
-        if key is not None:
-            config['key'] = key
-        if token is not None:
-            config['token'] = token
-        if certtoken is not None:
-            config['certtoken'] = certtoken
-        if debug is not None:
-            config['debug'] = debug
-        if raw is not None:
-            config['raw'] = raw
-        if use_sessions is not None:
-            config['use_sessions'] = use_sessions
-        if profile is not None:
-            config['profile'] = profile
-        if base_url is not None:
-            config['base_url'] = base_url
-        if global_request_timeout is not None:
-            config['global_request_timeout'] = global_request_timeout
-        if max_request_retries is not None:
-            config['max_request_retries'] = max_request_retries
+        overrides = {
+            'email': email,
+            'key': key,
+            'token': token,
+            'certtoken': certtoken,
+            'debug': debug,
+            'raw': raw,
+            'use_sessions': use_sessions,
+            'profile': profile,
+            'base_url': base_url,
+            'global_request_timeout': global_request_timeout,
+            'max_request_retries': max_request_retries,
+            'pool_maxsize': pool_maxsize,
+        }
+        config.update({k: v for k, v in overrides.items() if v is not None})
 
         # we do not need to handle item.call values - they pass straight thru
 
-        for x in config:
-            if config[x] == '':
-                config[x] = None
+        config = {k: (None if v == '' else v) for k, v in config.items()}
 
         self._base = self._v4base(config)
 
+        # the _base method that handles each type of endpoint - see add()
+        # (kept here vs on _base so that _base doesn't hold a reference to itself)
+        self._dispatch = {
+            'VOID': self._base.do_void,
+            'OPEN': self._base.do_open,
+            'AUTH': self._base.do_auth,
+            'AUTH_UNWRAPPED': self._base.do_auth_unwrapped,
+            'CERT': self._base.do_certauth,
+        }
+
         # add the API calls
         try:
             api_v4(self)
@@ -975,12 +779,19 @@ class CloudFlare():
 
         raise TypeError('object is not callable')
 
+    def close(self):
+        """ Close any open network connections """
+
+        if self._base:
+            self._base.network.close()
+
     def __enter__(self):
         """ Cloudflare v4 API"""
         return self
 
     def __exit__(self, t, v, tb):
         """ Cloudflare v4 API"""
+        self.close()
         if t is None:
             return True
         # pretend we didn't deal with raised error - which is true
@@ -1015,8 +826,5 @@ class CloudFlare():
     def __getattr__(self, key):
         """ __getattr__ """
 
-        # this code will expand later
-        if key in dir(self):
-            return self[key]
-        # this is call to a non-existent endpoint
+        # only called once normal lookup has failed - this is call to a non-existent endpoint
         raise AttributeError(key)
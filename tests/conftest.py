@@ -0,0 +1,27 @@
+""" shared test fixtures """
+
+import os
+import sys
+sys.path.insert(0, os.path.abspath('..'))
+
+import pytest
+
+import CloudFlare
+
+class FakeResponse:
+    def __init__(self, content_type, body, status_code):
+        self.headers = {'Content-Type': content_type} if content_type else {}
+        self.content = body
+        self.status_code = status_code
+
+@pytest.fixture
+def fake_client():
+    """ a client whose network calls are answered by respond(method, url, params) -> (content_type, body, status_code) """
+
+    def make(respond):
+        cf = CloudFlare.CloudFlare(token='0123456789abcdef0123456789abcdef01234567')
+        def network(method, url, headers=None, params=None, data=None, files=None):
+            return FakeResponse(*respond(method, url, params))
+        cf._base.network = network
+        return cf
+    return make
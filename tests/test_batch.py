@@ -0,0 +1,50 @@
+""" batch tests - no network required """
+
+import os
+import sys
+import json
+sys.path.insert(0, os.path.abspath('..'))
+
+import pytest
+
+import CloudFlare
+
+def respond(method, url, params):
+    if url.endswith('/bad'):
+        # no error_chain - so the exception has a len() of 0
+        return 'application/json', json.dumps({'success': False, 'errors': [{'code': 1003, 'message': 'bad'}]}).encode('utf-8'), 400
+    return 'application/json', json.dumps({'success': True, 'result': {'method': method, 'url': url, 'params': params}}).encode('utf-8'), 200
+
+class TestBatch:
+    def test_batch_order(self, fake_client):
+        cf = fake_client(respond)
+        results = cf.batch([(cf.zones, 'GET', 'z%d' % (n)) for n in range(20)], max_workers=4)
+        assert [r['url'] for r in results] == [cf._base.base_url + '/zones/z%d' % (n) for n in range(20)]
+
+    def test_batch_dependent_waves(self, fake_client):
+        cf = fake_client(respond)
+        results = cf.batch([
+            (cf.zones, 'GET', None, {'name': 'example.com'}),
+            (cf.accounts, 'get', ('a1',)),
+            lambda previous: (cf.zones.dns_records, 'POST', (previous[1]['url'][-2:], 'r1')),
+            lambda previous: (cf.zones.settings, 'PATCH', (str(len(previous)),)),
+            (cf.ips, 'GET'),
+        ])
+        assert results[0]['params'] == {'name': 'example.com'}
+        assert results[1]['url'].endswith('/accounts/a1')
+        assert results[2]['method'] == 'POST'
+        assert results[2]['url'].endswith('/zones/a1/dns_records/r1')
+        assert results[3]['url'].endswith('/zones/2/settings')
+        assert results[4]['url'].endswith('/ips')
+
+    def test_batch_error(self, fake_client):
+        cf = fake_client(respond)
+        with pytest.raises(CloudFlare.exceptions.CloudFlareAPIError) as e:
+            cf.batch([(cf.zones, 'GET', 'z1'), (cf.zones, 'GET', 'bad')])
+        assert int(e.value) == 1003
+
+    def test_batch_bad_method(self, fake_client):
+        cf = fake_client(respond)
+        for method in ('dns_records', 'fetch'):
+            with pytest.raises(CloudFlare.exceptions.CloudFlareAPIError):
+                cf.batch([(cf.zones, method, 'z1')])
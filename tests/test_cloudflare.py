@@ -17,3 +17,24 @@ class TestCloudflare:
     def test_with_max_request_retries(self):
         cf = CloudFlare.CloudFlare({'max_request_retries': 2})
         assert isinstance(cf, CloudFlare.CloudFlare)
+
+    def test_with_context_manager(self):
+        with CloudFlare.CloudFlare() as cf:
+            assert isinstance(cf, CloudFlare.CloudFlare)
+        # closing is safe to repeat
+        cf.close()
+
+    def test_missing_endpoint(self):
+        cf = CloudFlare.CloudFlare()
+        assert hasattr(cf, 'zones')
+        assert not hasattr(cf, 'no_such_endpoint')
+
+    def test_with_pool_maxsize(self):
+        cf = CloudFlare.CloudFlare(pool_maxsize=20)
+        assert isinstance(cf, CloudFlare.CloudFlare)
+
+    def test_nested_endpoints(self):
+        cf = CloudFlare.CloudFlare()
+        assert str(cf.zones.dns_records) == '[/zones/:id/dns_records]'
+        assert 'dns_records' in dir(cf.zones)
+        assert not hasattr(cf.zones, 'no_such_endpoint')
@@ -18,3 +18,13 @@ class TestCloudflare:
         assert len(ips['ipv4_cidrs']) > 0
         assert len(ips['ipv6_cidrs']) > 0
 
+    def test_ips_batch(self):
+        # no auth required
+        cf = CloudFlare.CloudFlare()
+        results = cf.batch([(cf.ips, 'GET'), (cf.ips, 'GET')])
+        assert isinstance(results, list)
+        assert len(results) == 2
+        for ips in results:
+            assert isinstance(ips, dict)
+            assert len(ips['ipv4_cidrs']) > 0
+            assert len(ips['ipv6_cidrs']) > 0
@@ -0,0 +1,65 @@
+""" response handling tests - no network required """
+
+import os
+import sys
+sys.path.insert(0, os.path.abspath('..'))
+
+import pytest
+
+import CloudFlare
+
+# (content type, body, status code, wrapped result, unwrapped result) - an int result is the CloudFlareAPIError code raised
+RESPONSES = [
+    ('application/json', b'{"success": true, "result": {"a": 1}}', 200, {'a': 1}, {'success': True, 'result': {'a': 1}}),
+    ('application/json; charset=utf-8', b'{"success": true, "result": {"a": 1}}', 200, {'a': 1}, {'success': True, 'result': {'a': 1}}),
+    ('application/json', b'[1, 2]', 200, [1, 2], {'success': True, 'result': [1, 2]}),
+    ('application/json', b'', 200, None, {'success': True, 'result': None}),
+    ('application/json', b'', 404, 99998, {'success': False, 'code': 404, 'result': None}),
+    ('application/json', b'plain words', 200, 0, 0),
+    ('application/json', b'{"a":1}\n{"b":2}\n', 200, [{'a': 1}, {'b': 2}], [{'a': 1}, {'b': 2}]),
+    ('application/json', b'{"success": false, "errors": [{"code": 1000, "message": "no"}]}', 400,
+        1000, {'success': False, 'errors': [{'code': 1000, 'message': 'no'}]}),
+    ('application/x-ndjson', b'{"a":1}\n{"b":2}\n', 200, [{'a': 1}, {'b': 2}], [{'a': 1}, {'b': 2}]),
+    ('application/x-ndjson', b'', 200, [], []),
+    ('application/x-ndjson', b'{"a":1}\n', 404, 99998, {'success': False, 'code': 404, 'result': [{'a': 1}]}),
+    ('application/x-ndjson', b'plain words', 200, 0, 0),
+    ('application/octet-stream', b'{"success": true, "result": {"a": 1}}', 200, {'a': 1}, {'success': True, 'result': {'a': 1}}),
+    ('application/octet-stream', b'[1, 2]', 200, [1, 2], {'success': True, 'result': [1, 2]}),
+    ('application/octet-stream', b'[1, 2]', 404, 99998, {'success': False, 'code': 404, 'result': [1, 2]}),
+    ('application/octet-stream', b'plain words', 200, 'plain words', {'success': True, 'result': 'plain words'}),
+    ('application/octet-stream', b'plain words', 404, 99998, {'success': False, 'code': 404, 'result': 'plain words'}),
+    (None, b'"hi"', 200, 'hi', {'success': True, 'result': 'hi'}),
+    ('text/plain', b'"hi"', 200, 'hi', {'success': True, 'result': 'hi'}),
+    ('text/plain', b'', 200, '', {'success': True, 'result': ''}),
+    ('text/plain', b'plain words', 200, 'plain words', {'success': True, 'result': 'plain words'}),
+    ('text/plain', b'plain words', 404, 99998, {'success': False, 'code': 404, 'result': 'plain words'}),
+    ('text/html', b'<p>', 200, "b'<p>'", {'success': True, 'result': "b'<p>'"}),
+    ('text/html', b'<p>', 404, 99998, {'success': False, 'code': 404, 'result': "b'<p>'"}),
+    ('text/javascript', b'x()', 200, "b'x()'", {'success': True, 'result': "b'x()'"}),
+    ('application/javascript', b'x()', 200, "b'x()'", {'success': True, 'result': "b'x()'"}),
+]
+
+def call(endpoint):
+    try:
+        return endpoint.get('z')
+    except CloudFlare.exceptions.CloudFlareAPIError as e:
+        return int(e)
+
+class TestResponses:
+    @pytest.mark.parametrize('content_type, body, status_code, wrapped, unwrapped', RESPONSES)
+    def test_response(self, fake_client, content_type, body, status_code, wrapped, unwrapped):
+        cf = fake_client(lambda *args: (content_type, body, status_code))
+        assert call(cf.zones) == wrapped
+        assert call(cf.zones.logs.received) == unwrapped
+
+    def test_error_not_a_dict(self, fake_client):
+        cf = fake_client(lambda *args: ('application/json', b'{"success": false, "errors": ["s"]}', 400))
+        with pytest.raises(CloudFlare.exceptions.CloudFlareAPIError) as e:
+            cf.zones.get('z')
+        assert int(e.value) == 99998
+
+    def test_error_empty_list(self, fake_client):
+        cf = fake_client(lambda *args: ('application/json', b'{"success": false, "errors": []}', 400))
+        with pytest.raises(CloudFlare.exceptions.CloudFlareAPIError) as e:
+            cf.zones.get('z')
+        assert int(e.value) == 99998